@@ -1,53 +1,77 @@
 """Implementation of command-line minesweeper by Abdul Basit Tonmoy
 Spacial Thanks to Kylie Ying"""
 
+import array
 import random
-import re
+
+# bombs are stored as -1 on the board, every other cell holds its 0-8 neighbour count
+BOMB = -1
+# on big boards we only work out a cell's count once we need it, until then it holds this
+UNCOUNTED = 9
+
+# (row, col) offsets of the 8 cells surrounding a square
+NEIGHBOR_OFFSETS = (
+    (-1, -1), (-1, 0), (-1, 1),  # top left, top middle, top right
+    (0, -1),           (0, 1),   # left, right
+    (1, -1),  (1, 0),  (1, 1),   # bottom left, bottom middle, bottom right
+)
 
 
 # let's create a board object to represent the minesweeper game
 # this is so that we can just say "create a new board object", or
 # "dig here", or render this game for this object"
 class Board:
+    # a board always has exactly these attributes, so we list them here and python can store
+    # them in fixed slots instead of giving every board its own __dict__
+    __slots__ = ('dimension_size', 'num_bombs', 'lazy_counts', 'board', 'dug', 'dug_count', 'reveal_all')
+
+    # what each cell value looks like once it's been dug up. we build these strings once
+    # here so printing the board doesn't have to call str() on every single cell
+    _CELL_STR = {value: str(value) for value in range(9)}
+    _CELL_STR[BOMB] = '*'
+    # what a cell we haven't dug yet looks like
+    _HIDDEN_STR = ' '
+    # boards with more cells than this get their neighbour counts filled in lazily while digging,
+    # since the player will only ever look at a small part of them
+    _EAGER_MAX_CELLS = 64 * 64
+
     def __init__(self, dimension_size, num_bombs):
         # let's keep track of these parameters, they'll be helpful later
         self.dimension_size = dimension_size
         self.num_bombs = num_bombs
 
         # let's create the board
+        self.lazy_counts = self.dimension_size * self.dimension_size > self._EAGER_MAX_CELLS
         self.board = self.make_new_board()
-        self.assign_values_to_board()
+        if not self.lazy_counts:
+            self.assign_values_to_board()
 
-        # Initialize a set to keep track of which locations we've uncovered
-        # we'll save (row, col) tuples into this set
-        self.dug = set()
+        # Initialize a bitmap to keep track of which locations we've uncovered
+        # it's laid out just like the board: dug[row * dimension_size + col] is 1 once we've dug there
+        self.dug = bytearray(self.dimension_size * self.dimension_size)
+        # and how many squares we've dug so far, so we don't have to count the bitmap every turn
+        self.dug_count = 0
+        # when this is set, printing the board shows every square, dug or not (e.g. after game over)
+        self.reveal_all = False
 
     def make_new_board(self):
         # construct a new board based on the dimension size and num bomb
-        # we  should construct the list of lists (or whatever representation you prefer
-        # but since we have a 2D board, list of list is most natural)
+        # instead of a list of lists of python objects, we keep the whole board in one flat
+        # array of signed bytes. the cell at (row, col) lives at index row * dimension_size + col
 
         # generate a new board
-        board = [[None for _ in range(self.dimension_size)] for _ in range(self.dimension_size)]
+        # (counts start at 0 if we're going to fill them all in right away, otherwise as UNCOUNTED)
+        fill = UNCOUNTED if self.lazy_counts else 0
+        board = array.array('b', [fill]) * (self.dimension_size * self.dimension_size)
         # this creates an array like this:
-        # [[None, None, ...., None],
-        # [None, None,  ...., None],
-        # [...                    ],
-        # [None, None,  ...., None],]
+        # [0, 0, ...., 0, 0, 0, ...., 0, ...., 0]
+        #  \_ row 0 _/  \_ row 1 _/       \_ last row
         # we can see how this represents a board!
-        bombs_planted = 0
-        while bombs_planted < self.num_bombs:
-            loc = random.randint(0, self.dimension_size**2 - 1)  # return a random integer N such that a <= N <= b
-            row = loc // self.dimension_size  # we want the number of times dimension_size
-            # goes into loc to tell us what row to look at
-            col = loc % self.dimension_size  # we want the remainder to tell us what index in the row to look at
-
-            if board[row][col] == "*":
-                # this means we've actually planted a bomb there already so keep going
-                continue
 
-            board[row][col] = "*"  # plant the bomb
-            bombs_planted += 1
+        # pick all the bomb locations in one go. random.sample never returns the same
+        # location twice, so we don't have to check for bombs we've already planted
+        for loc in random.sample(range(self.dimension_size**2), self.num_bombs):
+            board[loc] = BOMB  # plant the bomb
 
         return board
 
@@ -55,36 +79,47 @@ class Board:
         # now that we have the bombs planted, let's assign a number 0-8 for all the empty spaces, which
         # represents how many neighbouring bombs there are. We can precompute these and it'll save us some
         # effort checking what's around the board later on :))
-        for r in range(self.dimension_size):
-            for c in range(self.dimension_size):
-                if self.board[r][c] == "*":
-                    # if this is already a bomb, we don't want to calculate anything
-                    continue
-                self.board[r][c] = self.get_num_neighboring_bombs(r, c)
-
-    def get_num_neighboring_bombs(self, row, col):
-        # let's iterate though each of the neighboring positions and sum number of bombs
-        # top left: (row-1, col-1)
-        # top middle: (row-1, col)
-        # top right: (row-1, col+1)
-        # left: (row, col-1)
-        # right: (row, col+1)
-        # bottom left: (row+1, col-1)
-        # bottom middle: (row+1, col)
-        # bottom right: (row+1, col+1)
+        # instead of looking around every cell for bombs, we turn it around: every bomb adds one
+        # to each of its neighbours. the board starts out all zeros, so we only touch the
+        # (at most) 8 neighbours of each bomb rather than all 9 cells around every square
 
         # make sure to not go out of bounds!
+        # (we pull these out into locals since local lookups are cheaper than self.attribute ones)
+        ds = self.dimension_size
+        board = self.board
+        for loc in range(ds * ds):
+            if board[loc] != BOMB:
+                continue
+            row, col = loc // ds, loc % ds
+            for dr, dc in NEIGHBOR_OFFSETS:
+                r, c = row + dr, col + dc
+                if 0 <= r < ds and 0 <= c < ds and board[r*ds + c] != BOMB:
+                    # bombs don't get a count
+                    board[r*ds + c] += 1
+
+    def _count_and_store(self, loc):
+        # count the bombs around a single (flat) location and write the answer into self.board,
+        # this is how big boards fill in their UNCOUNTED cells as we dig. returns the count
+        ds = self.dimension_size
+        board = self.board
+        row, col = loc // ds, loc % ds
 
         num_neighbouring_bombs = 0
-        for r in range(max(0, row-1), min(self.dimension_size-1, row+1)+1):
-            for c in range(max(0, col-1), min(self.dimension_size-1, col+1)+1):
-                if r == row and c == col:
-                    continue
-                if self.board[r][c] == "*":
-                    num_neighbouring_bombs += 1
+        for dr, dc in NEIGHBOR_OFFSETS:
+            r, c = row + dr, col + dc
+            if 0 <= r < ds and 0 <= c < ds and board[r*ds + c] == BOMB:
+                num_neighbouring_bombs += 1
 
+        board[loc] = num_neighbouring_bombs
         return num_neighbouring_bombs
 
+    def get_value(self, loc):
+        # what's at this location: BOMB or the 0-8 count, working it out first if we haven't yet
+        value = self.board[loc]
+        if value == UNCOUNTED:
+            value = self._count_and_store(loc)
+        return value
+
     def dig(self, row, col):
         # dig at that location
         # return True if successful dig, False if bomb dug
@@ -92,21 +127,85 @@ class Board:
         # a few scenarios:
         # hit a bomb -> game over
         # dig at a location with neighboring bombs -> finish digging
-        # dig at a location with no neighboring bombs -> recursively dig neighbors!
-
-        self.dug.add((row, col))  # keep track that we dug here
-
-        if self.board[row][col] == "*":
+        # dig at a location with no neighboring bombs -> keep digging neighbors!
+
+        # (on big boards a cell may still be UNCOUNTED, so every time we look at a cell we
+        # work out its count first if we have to)
+        ds = self.dimension_size
+        board = self.board
+        dug = self.dug
+        count = self._count_and_store
+        if dug[row*ds + col]:
+            return True  # don't dig where you've already dug
+
+        value = board[row*ds + col]
+        if value == UNCOUNTED:
+            value = count(row*ds + col)
+        if value == BOMB:
+            dug[row*ds + col] = 1  # keep track that we dug here
+            self.dug_count += 1
             return False
-        elif self.board[row][col] > 0:
+        elif value > 0:
+            dug[row*ds + col] = 1
+            self.dug_count += 1
             return True
 
-        # self.board[row][col] == 0
-        for r in range(max(0, row-1), min(self.dimension_size-1, row+1)+1):
-            for c in range(max(0, col-1), min(self.dimension_size-1, col+1)+1):
-                if (r, c) in self.dug:
-                    continue  # don't dig where you've already dug
-                self.dig(r, c)
+        # value == 0, so we flood out over the empty region a whole row
+        # segment at a time (a "scanline" fill) instead of one square at a time.
+        # we only ever put the first square of each run of undug zeros on the stack
+        dug_count = self.dug_count
+        stack = [(row, col)]
+        while stack:
+            r, c = stack.pop()
+            if dug[r*ds + c]:
+                continue  # this run was already dug from another seed
+
+            # walk left and right along the row for as long as we see undug zeros
+            left = c
+            while left > 0 and not dug[r*ds + left-1]:
+                value = board[r*ds + left-1]
+                if value == UNCOUNTED:
+                    value = count(r*ds + left-1)
+                if value != 0:
+                    break
+                left -= 1
+            right = c
+            while right < ds-1 and not dug[r*ds + right+1]:
+                value = board[r*ds + right+1]
+                if value == UNCOUNTED:
+                    value = count(r*ds + right+1)
+                if value != 0:
+                    break
+                right += 1
+            for i in range(r*ds + left, r*ds + right+1):
+                dug[i] = 1
+            dug_count += right - left + 1
+
+            # now look at the rows above and below, as well as the ends of this run
+            # (one square further out on each side, so diagonals count too)
+            # numbered squares next to the run get dug right away, and each new run of
+            # undug zeros gets a seed on the stack
+            for nr in range(max(0, r-1), min(ds-1, r+1)+1):
+                in_run = False
+                for nc in range(max(0, left-1), min(ds-1, right+1)+1):
+                    i = nr*ds + nc
+                    if dug[i]:
+                        in_run = False
+                        continue
+                    value = board[i]
+                    if value == UNCOUNTED:
+                        value = count(i)
+                    if value == 0:
+                        if not in_run:
+                            stack.append((nr, nc))
+                        in_run = True
+                    else:
+                        # next to a zero, so this can't be a bomb
+                        dug[i] = 1
+                        dug_count += 1
+                        in_run = False
+
+        self.dug_count = dug_count
 
         # if our initial dig didn't hit a bomb, we *shouldn't* hit a bomb here
         return True
@@ -116,49 +215,37 @@ class Board:
         # it'll print out what this function returns!
         # return a string that shows the board to the player
 
-        # first let's create a new array that represents what the user would see
-        visible_board = [[None for _ in range(self.dimension_size)] for _ in range(self.dimension_size)]
-        for row in range(self.dimension_size):
-            for col in range(self.dimension_size):
-                if (row, col) in self.dug:
-                    visible_board[row][col] = str(self.board[row][col])
-                else:
-                    visible_board[row][col] = ' '
-
-        # put this together in a string
-        string_rep = ''
-        # get max column widths for printing
-        widths = []
-        for idx in range(self.dimension_size):
-            columns = map(lambda x: x[idx], visible_board)
-            widths.append(
-                len(
-                    max(columns, key=len)
-                )
-            )
+        ds = self.dimension_size
+        board = self.board
+        dug = self.dug
+        reveal_all = self.reveal_all
+        cell_str = self._CELL_STR
+        hidden_str = self._HIDDEN_STR
+
+        # everything we've dug already has its count, but if we're showing the whole board
+        # we might still have to work some of them out
+        if reveal_all and self.lazy_counts:
+            for loc in range(ds * ds):
+                self.get_value(loc)
 
         # print the csv strings
-        indices = [i for i in range(self.dimension_size)]
-        indices_row = '   '
-        cells = []
-        for idx, col in enumerate(indices):
-            format = '%-' + str(widths[idx]) + "s"
-            cells.append(format % (col))
-        indices_row += '  '.join(cells)
-        indices_row += '  \n'
-
-        for i in range(len(visible_board)):
-            row = visible_board[i]
-            string_rep += f'{i} |'
+        indices_row = '   ' + '  '.join(str(col) for col in range(ds)) + '  \n'
+
+        # now build each row of what the user would see straight from the board, in a single pass.
+        # every cell is a single character (' ', '0'-'8' or '*'), so every column is 1 wide and
+        # we don't need to pad anything. we collect the rows in a list and join them at the end,
+        # which is much cheaper than growing one big string with += for every row
+        rows_out = []
+        for row in range(ds):
+            row_base = row * ds
             cells = []
-            for idx, col in enumerate(row):
-                format = '%-' + str(widths[idx]) + "s"
-                cells.append(format % (col))
-            string_rep += ' |'.join(cells)
-            string_rep += ' |\n'
+            for loc in range(row_base, row_base + ds):
+                cells.append(cell_str[board[loc]] if reveal_all or dug[loc] else hidden_str)
+            rows_out.append(f'{row} |' + ' |'.join(cells) + ' |')
 
-        str_len = int(len(string_rep) / self.dimension_size)
-        string_rep = indices_row + '-'*str_len + '\n' + string_rep + '-'*str_len
+        # each row is as long as its text plus the newline after it
+        str_len = int((sum(map(len, rows_out)) + len(rows_out)) / ds)
+        string_rep = indices_row + '-'*str_len + '\n' + '\n'.join(rows_out) + '\n' + '-'*str_len
 
         return string_rep
 
@@ -175,13 +262,17 @@ def play(dimension_size=10, num_bombs=10):
     # Step 4 : repeat steps 2 and 3(a)/(b) until there are no more places to dig --> VICTORY
     safe = True
 
-    while len(board.dug) < board.dimension_size ** 2 - num_bombs:
+    # keep going until every square that isn't a bomb has been dug
+    cells_to_dig = board.dimension_size * board.dimension_size - num_bombs
+    while board.dug_count < cells_to_dig:
         print(board)
         # 0,0 or 0, 0 or 0,    0
-        user_input = re.split(',(\\s)*', input("Where would you like to dig? Input as row,col: "))  # (0, 3)
+        # int() ignores the spaces around each number for us, so a plain split is enough
+        user_input = input("Where would you like to dig? Input as row,col: ").split(',')  # (0, 3)
         row, col = int(user_input[0]), int(user_input[-1])
         if row < 0 or row >= board.dimension_size or col < 0 or col >= board.dimension_size:
             print("Invalid location. Try again")
+            continue
 
         # if it's valid, we dig
         safe = board.dig(row, col)
@@ -193,7 +284,7 @@ def play(dimension_size=10, num_bombs=10):
         print("CONGRATULATIONS!!! YOU HAVE WON!")
     else:
         print("SORRY, GAME OVER :( ")
-        board.dug = [(r,c) for r in range(board.dimension_size) for c in range(board.dimension_size)]
+        board.reveal_all = True
         print(board)
 
 
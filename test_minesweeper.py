@@ -0,0 +1,86 @@
+"""Checks that dig uncovers exactly the squares a plain 8-neighbour flood would"""
+
+import random
+import unittest
+
+from minesweeper import BOMB, Board
+
+
+class LazyBoard(Board):
+    # same board, but always take the lazy path where counts are filled in while digging
+    _EAGER_MAX_CELLS = 0
+
+
+def naive_flood(board, row, col):
+    # the simple flood fill dig used to do: dig here, and if it's a zero dig all 8 neighbours too
+    ds = board.dimension_size
+    seen = set()
+    stack = [(row, col)]
+    while stack:
+        r, c = stack.pop()
+        if (r, c) in seen:
+            continue
+        seen.add((r, c))
+        if board.get_value(r*ds + c) != 0:
+            continue
+        for nr in range(max(0, r-1), min(ds-1, r+1)+1):
+            for nc in range(max(0, c-1), min(ds-1, c+1)+1):
+                stack.append((nr, nc))
+    return seen
+
+
+class DigTest(unittest.TestCase):
+    def check_digs(self, board, digs):
+        ds = board.dimension_size
+        expected = set()
+        for row, col in digs:
+            if (row, col) not in expected:
+                expected |= naive_flood(board, row, col)
+            safe = board.dig(row, col)
+
+            dug = {(loc // ds, loc % ds) for loc in range(ds * ds) if board.dug[loc]}
+            self.assertEqual(dug, expected)
+            self.assertEqual(board.dug_count, sum(board.dug))
+            self.assertEqual(safe, board.get_value(row*ds + col) != BOMB)
+            if not safe:
+                break
+
+    def check_seeds(self, board_class):
+        for seed in range(50):
+            random.seed(seed)
+            ds = random.randint(1, 15)
+            num_bombs = random.randint(0, ds * ds // 4)
+            board = board_class(ds, num_bombs)
+            # corners, the middle of each edge and the centre
+            last = ds - 1
+            digs = [(0, 0), (0, last), (last, 0), (last, last),
+                    (0, last // 2), (last, last // 2), (last // 2, 0), (last // 2, last),
+                    (last // 2, last // 2)]
+            with self.subTest(seed=seed, ds=ds, num_bombs=num_bombs):
+                self.check_digs(board, digs)
+
+    def test_matches_naive_flood(self):
+        self.check_seeds(Board)
+
+    def test_matches_naive_flood_lazy(self):
+        self.check_seeds(LazyBoard)
+
+    def test_empty_board_digs_everything(self):
+        for board_class in (Board, LazyBoard):
+            board = board_class(12, 0)
+            self.assertTrue(board.dig(5, 7))
+            self.assertEqual(board.dug_count, 12 * 12)
+
+    def test_one_by_one(self):
+        for board_class in (Board, LazyBoard):
+            board = board_class(1, 0)
+            self.assertTrue(board.dig(0, 0))
+            self.assertEqual(board.dug_count, 1)
+
+            board = board_class(1, 1)
+            self.assertFalse(board.dig(0, 0))
+            self.assertEqual(board.dug_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()